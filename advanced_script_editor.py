@@ -1,13 +1,17 @@
 import sys
 import os
-import subprocess
+import time
+import codecs
+from functools import lru_cache
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QFileDialog, QDockWidget, QTextEdit, QTabWidget,
-    QAction, QMessageBox, QToolBar, QStatusBar, QLabel, QComboBox, QInputDialog,
+    QApplication, QMainWindow, QFileDialog, QDockWidget, QTextEdit, QPlainTextEdit,
+    QTabWidget,
+    QAction, QMessageBox, QToolBar, QStatusBar, QLabel, QLineEdit, QComboBox,
+    QInputDialog,
     QTreeView, QFileSystemModel, QWidget, QHBoxLayout, QVBoxLayout
 )
-from PyQt5.QtGui import QFont, QIcon, QColor, QPalette
-from PyQt5.QtCore import Qt, QProcess
+from PyQt5.QtGui import QFont, QIcon, QColor, QPalette, QTextCursor
+from PyQt5.QtCore import Qt, QProcess, QFile, QIODevice, QTextStream, QRegularExpression, QTimer
 
 # Optional: QScintilla for syntax highlighting
 try:
@@ -16,59 +20,146 @@ try:
 except ImportError:
     USE_QSCINTILLA = False
 
-# Optional: Jedi for Python completion
-try:
-    import jedi
-    USE_JEDI = True
-except ImportError:
-    USE_JEDI = False
-
 SUPPORTED_EXTENSIONS = {
     ".py": "Python",
     ".bat": "Batch",
     ".ps1": "PowerShell"
 }
 
+LANG_TO_EXT = {v: k for k, v in SUPPORTED_EXTENSIONS.items()}
+
+READ_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+RUNNERS = {
+    ".py": lambda path: ["python", path],
+    ".bat": lambda path: ["cmd.exe", "/c", path],
+    ".ps1": lambda path: ["powershell", "-File", path]
+}
+
 LEXERS = {
     "Python": QsciLexerPython if USE_QSCINTILLA else None,
     "Batch": QsciLexerBatch if USE_QSCINTILLA else None,
     "PowerShell": QsciLexerPowerShell if USE_QSCINTILLA else None
 }
 
+@lru_cache(maxsize=32)
+def _icon(name):
+    """Look up a theme icon once per name; QIcon instances are shared."""
+    return QIcon.fromTheme(name)
+
+_LIGHT_PALETTE = None
+_DARK_PALETTE = None
+
+def _palettes():
+    """Build the light/dark palettes once; toggling just swaps them."""
+    global _LIGHT_PALETTE, _DARK_PALETTE
+    if _LIGHT_PALETTE is None:
+        light = QPalette()
+        light.setColor(QPalette.Window, QColor(240, 240, 240))
+        light.setColor(QPalette.WindowText, Qt.black)
+        light.setColor(QPalette.Base, Qt.white)
+        light.setColor(QPalette.Text, Qt.black)
+        dark = QPalette()
+        dark.setColor(QPalette.Window, QColor(53, 53, 53))
+        dark.setColor(QPalette.WindowText, Qt.white)
+        dark.setColor(QPalette.Base, QColor(35, 35, 35))
+        dark.setColor(QPalette.Text, Qt.white)
+        _LIGHT_PALETTE, _DARK_PALETTE = light, dark
+    return _LIGHT_PALETTE, _DARK_PALETTE
+
+@lru_cache(maxsize=16)
+def _get_lexer(ext):
+    """Return a shared lexer instance for the given extension, or None."""
+    lexer_cls = LEXERS.get(SUPPORTED_EXTENSIONS.get(ext))
+    if not lexer_cls:
+        return None
+    lexer = lexer_cls()
+    lexer.setDefaultFont(QFont("Consolas", 12))
+    return lexer
+
 class ScriptTab(QsciScintilla if USE_QSCINTILLA else QTextEdit):
     def __init__(self, file_path=None):
         super().__init__()
         self.file_path = file_path
+        self._ext = os.path.splitext(file_path)[1].lower() if file_path else ""
         self.setFont(QFont("Consolas", 12))
         if USE_QSCINTILLA:
             self.setUtf8(True)
         if file_path:
-            with open(file_path, "r", encoding="utf-8") as f:
-                text = f.read()
-                if USE_QSCINTILLA:
-                    self.setText(text)
-                else:
-                    self.setText(text)
-            self.set_lexer_by_extension(file_path)
-    
-    def set_lexer_by_extension(self, file_path):
+            self.load_file(file_path)
+            self.set_lexer_by_extension()
+
+    def load_file(self, file_path):
+        qf = QFile(file_path)
+        if not qf.open(QIODevice.ReadOnly):
+            return
+        if USE_QSCINTILLA:
+            # read() pushes bytes straight into the Scintilla buffer,
+            # skipping the Python str round-trip entirely. Keep the
+            # initial load out of the undo history.
+            self.SendScintilla(QsciScintilla.SCI_SETUNDOCOLLECTION, 0)
+            self.read(qf)
+            self.SendScintilla(QsciScintilla.SCI_EMPTYUNDOBUFFER)
+            self.SendScintilla(QsciScintilla.SCI_SETUNDOCOLLECTION, 1)
+            self.setModified(False)
+        else:
+            stream = QTextStream(qf)
+            stream.setCodec("UTF-8")
+            if qf.size() < READ_CHUNK_SIZE:
+                # Small file: a single setText is cheapest.
+                self.setText(stream.readAll())
+            else:
+                # Large file: read in 1 MiB chunks and yield to the event
+                # loop between chunks so the window stays responsive.
+                self.setText("")
+                while not stream.atEnd():
+                    chunk = stream.read(READ_CHUNK_SIZE)
+                    self.moveCursor(QTextCursor.End)
+                    self.insertPlainText(chunk)
+                    QApplication.processEvents()
+                # The chunked inserts pollute the undo stack and mark the
+                # document modified; clear both, as the Scintilla branch
+                # does with SCI_SETUNDOCOLLECTION/setModified.
+                self.document().clearUndoRedoStacks()
+                self.document().setModified(False)
+        qf.close()
+
+    def set_lexer_by_extension(self):
         if not USE_QSCINTILLA:
             return
-        ext = os.path.splitext(file_path)[1]
-        lang = SUPPORTED_EXTENSIONS.get(ext)
-        lexer_cls = LEXERS.get(lang)
-        if lexer_cls:
-            lexer = lexer_cls()
-            lexer.setDefaultFont(QFont("Consolas", 12))
+        lexer = _get_lexer(self._ext)
+        if lexer:
             self.setLexer(lexer)
+            # One bulk recolor of the whole document beats the
+            # chunk-by-chunk idle styling repaints on big files.
+            self.recolor(0, -1)
+
+    def is_modified(self):
+        return self.isModified() if USE_QSCINTILLA else self.document().isModified()
+
+    def set_clean(self):
+        if USE_QSCINTILLA:
+            self.setModified(False)
+        else:
+            self.document().setModified(False)
 
     def save(self):
         if not self.file_path:
             self.file_path, _ = QFileDialog.getSaveFileName(self, "Save Script", "", "All Files (*)")
+            if self.file_path:
+                self._ext = os.path.splitext(self.file_path)[1].lower()
         if self.file_path:
+            if os.path.exists(self.file_path) and not self.is_modified():
+                return True  # Nothing changed; skip the rewrite.
             text = self.text() if USE_QSCINTILLA else self.toPlainText()
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                f.write(text)
+            # Encode once and write through a temp file so a crash
+            # mid-write never truncates the original.
+            data = text.encode("utf-8")
+            tmp_path = self.file_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.file_path)
+            self.set_clean()
             return True
         return False
 
@@ -76,45 +167,98 @@ class TerminalWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.process = QProcess()
-        self.output = QTextEdit()
+        # Incremental decoders carry multi-byte sequences that straddle
+        # chunk boundaries across readyRead signals.
+        self._stdout_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._stderr_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.output = QPlainTextEdit()
+        self.output.setMaximumBlockCount(5000)
         self.output.setReadOnly(True)
-        self.input = QTextEdit()
-        self.input.setMaximumHeight(40)
-        self.input.keyPressEvent = self.handle_keypress
+        self.input = QLineEdit()
+        self.input.returnPressed.connect(self.submit_command)
+        self.title_label = QLabel("Terminal")
         layout = QVBoxLayout()
-        layout.addWidget(QLabel("Terminal"))
+        layout.addWidget(self.title_label)
         layout.addWidget(self.output)
         layout.addWidget(self.input)
         self.setLayout(layout)
+        self.shell = "cmd.exe"
+        self._restart_attempts = 0
+        self._started_at = time.monotonic()
         self.process.readyReadStandardOutput.connect(self.on_stdout)
         self.process.readyReadStandardError.connect(self.on_stderr)
-
-    def handle_keypress(self, event):
-        if event.key() == Qt.Key_Return:
-            command = self.input.toPlainText().strip()
-            self.input.clear()
-            if command:
-                self.process.write((command + "\n").encode('utf-8'))
-
-    def start(self, shell="cmd.exe"):
-        self.process.start(shell)
+        self.process.started.connect(self.on_started)
+        self.process.finished.connect(self.on_exit)
+
+    def submit_command(self):
+        command = self.input.text().strip()
+        self.input.clear()
+        if command and self.process.state() == QProcess.Running:
+            self.process.write((command + "\n").encode('utf-8'))
+
+    def start(self, shell=None):
+        if shell:
+            self.shell = shell
+        self.process.start(self.shell)
+
+    def on_started(self):
+        self._started_at = time.monotonic()
+        self.title_label.setText(f"Terminal (pid {self.process.processId()})")
+
+    def on_exit(self, exit_code, exit_status):
+        # Restart the shell so the pane keeps working after it exits;
+        # reset the decoders to drop any half-read sequence.
+        self._stdout_decoder.reset()
+        self._stderr_decoder.reset()
+        if time.monotonic() - self._started_at > 5:
+            # The shell ran for a while, so this is a normal exit
+            # rather than a spawn loop.
+            self._restart_attempts = 0
+        self._restart_attempts += 1
+        if self._restart_attempts > 3:
+            self.output.appendPlainText(
+                f"[shell exited with code {exit_code}; giving up after repeated immediate exits]")
+            self.title_label.setText("Terminal (stopped)")
+            return
+        self.output.appendPlainText(f"[shell exited with code {exit_code}; restarting]")
+        QTimer.singleShot(500, self.start)
 
     def on_stdout(self):
-        data = self.process.readAllStandardOutput().data().decode()
-        self.output.append(data)
+        data = self._stdout_decoder.decode(bytes(self.process.readAllStandardOutput()))
+        if data:
+            self.output.appendPlainText(data)
 
     def on_stderr(self):
-        data = self.process.readAllStandardError().data().decode()
-        self.output.append(data)
+        data = self._stderr_decoder.decode(bytes(self.process.readAllStandardError()))
+        if data:
+            self.output.appendPlainText(data)
+
+_FS_MODEL = None
+
+def _fs_model():
+    """Share one QFileSystemModel (and its file watchers) across explorers."""
+    global _FS_MODEL
+    if _FS_MODEL is None:
+        model = QFileSystemModel()
+        # Only show script files; skipping the rest avoids stat() calls
+        # and QFileInfo churn in large directories.
+        model.setNameFilters(["*" + ext for ext in SUPPORTED_EXTENSIONS])
+        model.setNameFilterDisables(False)
+        model.setResolveSymlinks(False)
+        model.setReadOnly(True)
+        _FS_MODEL = model
+    return _FS_MODEL
 
 class ExplorerDock(QDockWidget):
     def __init__(self, root_path):
         super().__init__("File Explorer")
         self.tree = QTreeView()
-        self.model = QFileSystemModel()
-        self.model.setRootPath(root_path)
+        self.model = _fs_model()
         self.tree.setModel(self.model)
-        self.tree.setRootIndex(self.model.index(root_path))
+        self.tree.setRootIndex(self.model.setRootPath(root_path))
+        # Hide the size/type/modified columns so they are never computed.
+        for column in range(1, 4):
+            self.tree.setColumnHidden(column, True)
         self.setWidget(self.tree)
 
 class ScriptEditor(QMainWindow):
@@ -128,6 +272,8 @@ class ScriptEditor(QMainWindow):
         self.setStatusBar(self.status)
         self.language_label = QLabel("Language: ")
         self.status.addPermanentWidget(self.language_label)
+        self._last_query = None
+        self._query_re = None
         self.init_toolbar()
         self.init_explorer()
         self.init_terminal()
@@ -138,30 +284,30 @@ class ScriptEditor(QMainWindow):
         toolbar = QToolBar("Main Toolbar")
         toolbar.setIconSize(Qt.QSize(24, 24))
         self.addToolBar(toolbar)
-        open_action = QAction(QIcon.fromTheme("document-open"), "Open", self)
+        open_action = QAction(_icon("document-open"), "Open", self)
         open_action.triggered.connect(self.open_file)
-        save_action = QAction(QIcon.fromTheme("document-save"), "Save", self)
+        save_action = QAction(_icon("document-save"), "Save", self)
         save_action.triggered.connect(self.save_file)
-        new_action = QAction(QIcon.fromTheme("document-new"), "New", self)
+        new_action = QAction(_icon("document-new"), "New", self)
         new_action.triggered.connect(self.new_file)
-        close_action = QAction(QIcon.fromTheme("window-close"), "Close Tab", self)
+        close_action = QAction(_icon("window-close"), "Close Tab", self)
         close_action.triggered.connect(self.close_tab)
         toolbar.addAction(open_action)
         toolbar.addAction(save_action)
         toolbar.addAction(new_action)
         toolbar.addAction(close_action)
         toolbar.addSeparator()
-        undo_action = QAction(QIcon.fromTheme("edit-undo"), "Undo", self)
+        undo_action = QAction(_icon("edit-undo"), "Undo", self)
         undo_action.triggered.connect(lambda: self.current_tab().undo())
-        redo_action = QAction(QIcon.fromTheme("edit-redo"), "Redo", self)
+        redo_action = QAction(_icon("edit-redo"), "Redo", self)
         redo_action.triggered.connect(lambda: self.current_tab().redo())
-        cut_action = QAction(QIcon.fromTheme("edit-cut"), "Cut", self)
+        cut_action = QAction(_icon("edit-cut"), "Cut", self)
         cut_action.triggered.connect(lambda: self.current_tab().cut())
-        copy_action = QAction(QIcon.fromTheme("edit-copy"), "Copy", self)
+        copy_action = QAction(_icon("edit-copy"), "Copy", self)
         copy_action.triggered.connect(lambda: self.current_tab().copy())
-        paste_action = QAction(QIcon.fromTheme("edit-paste"), "Paste", self)
+        paste_action = QAction(_icon("edit-paste"), "Paste", self)
         paste_action.triggered.connect(lambda: self.current_tab().paste())
-        find_action = QAction(QIcon.fromTheme("edit-find"), "Find", self)
+        find_action = QAction(_icon("edit-find"), "Find", self)
         find_action.triggered.connect(self.find_text)
         toolbar.addAction(undo_action)
         toolbar.addAction(redo_action)
@@ -170,9 +316,9 @@ class ScriptEditor(QMainWindow):
         toolbar.addAction(paste_action)
         toolbar.addAction(find_action)
         toolbar.addSeparator()
-        run_action = QAction(QIcon.fromTheme("system-run"), "Run Script", self)
-        run_action.triggered.connect(self.run_script)
-        toolbar.addAction(run_action)
+        self.run_action = QAction(_icon("system-run"), "Run Script", self)
+        self.run_action.triggered.connect(self.run_script)
+        toolbar.addAction(self.run_action)
         self.language_combo = QComboBox()
         self.language_combo.addItems(list(SUPPORTED_EXTENSIONS.values()))
         self.language_combo.currentTextChanged.connect(self.change_language)
@@ -196,32 +342,15 @@ class ScriptEditor(QMainWindow):
 
     def init_theme(self):
         self.dark_mode = False
-        self.set_light_palette()
+        self.apply_theme()
 
     def toggle_theme(self):
         self.dark_mode = not self.dark_mode
-        if self.dark_mode:
-            self.set_dark_palette()
-        else:
-            self.set_light_palette()
-
-    def set_light_palette(self):
-        app = QApplication.instance()
-        palette = QPalette()
-        palette.setColor(QPalette.Window, QColor(240, 240, 240))
-        palette.setColor(QPalette.WindowText, Qt.black)
-        palette.setColor(QPalette.Base, Qt.white)
-        palette.setColor(QPalette.Text, Qt.black)
-        app.setPalette(palette)
-
-    def set_dark_palette(self):
-        app = QApplication.instance()
-        palette = QPalette()
-        palette.setColor(QPalette.Window, QColor(53, 53, 53))
-        palette.setColor(QPalette.WindowText, Qt.white)
-        palette.setColor(QPalette.Base, QColor(35, 35, 35))
-        palette.setColor(QPalette.Text, Qt.white)
-        app.setPalette(palette)
+        self.apply_theme()
+
+    def apply_theme(self):
+        light, dark = _palettes()
+        QApplication.instance().setPalette(dark if self.dark_mode else light)
 
     def current_tab(self):
         widget = self.tabs.currentWidget()
@@ -233,8 +362,7 @@ class ScriptEditor(QMainWindow):
             tab = ScriptTab(file_path)
             self.tabs.addTab(tab, os.path.basename(file_path))
             self.tabs.setCurrentWidget(tab)
-            tab.set_lexer_by_extension(file_path)
-            self.language_label.setText(f"Language: {self.detect_language(file_path)}")
+            self.language_label.setText(f"Language: {self.detect_language(tab)}")
 
     def load_file_from_explorer(self, index):
         file_path = self.explorer.model.filePath(index)
@@ -242,8 +370,7 @@ class ScriptEditor(QMainWindow):
             tab = ScriptTab(file_path)
             self.tabs.addTab(tab, os.path.basename(file_path))
             self.tabs.setCurrentWidget(tab)
-            tab.set_lexer_by_extension(file_path)
-            self.language_label.setText(f"Language: {self.detect_language(file_path)}")
+            self.language_label.setText(f"Language: {self.detect_language(tab)}")
 
     def save_file(self):
         tab = self.current_tab()
@@ -252,14 +379,13 @@ class ScriptEditor(QMainWindow):
 
     def new_file(self):
         lang = self.language_combo.currentText()
-        ext = next(k for k, v in SUPPORTED_EXTENSIONS.items() if v == lang)
+        ext = LANG_TO_EXT[lang]
         file_path, _ = QFileDialog.getSaveFileName(self, "New Script", f"untitled{ext}", f"{lang} (*{ext})")
         if file_path:
             tab = ScriptTab(file_path)
             tab.setText("")  # Start empty
             self.tabs.addTab(tab, os.path.basename(file_path))
             self.tabs.setCurrentWidget(tab)
-            tab.set_lexer_by_extension(file_path)
             self.language_label.setText(f"Language: {lang}")
 
     def close_tab(self):
@@ -272,49 +398,77 @@ class ScriptEditor(QMainWindow):
         if not tab:
             return
         text, ok = QInputDialog.getText(self, "Find Text", "Enter the text to find:")
-        if ok and text:
-            if USE_QSCINTILLA:
-                pos = tab.findFirst(text, False, False, False, True)
-                if not pos:
-                    QMessageBox.information(self, "Find", "Text not found!")
+        if not ok or not text:
+            return
+        if USE_QSCINTILLA:
+            # Explicit flags: plain text, case-insensitive, wrap at end,
+            # search forward — hits the SCI_SEARCHINTARGET fast path.
+            found = tab.findFirst(text, False, False, False, True, True)
+            if not found:
+                QMessageBox.information(self, "Find", "Text not found!")
+        else:
+            # Compile the query once and reuse it across repeated finds.
+            if text != self._last_query:
+                self._last_query = text
+                self._query_re = QRegularExpression(
+                    QRegularExpression.escape(text),
+                    QRegularExpression.CaseInsensitiveOption)
+            cursor = tab.document().find(self._query_re, tab.textCursor())
+            if cursor.isNull():
+                QMessageBox.information(self, "Find", "Text not found!")
             else:
-                result = tab.find(text)
-                if not result:
-                    QMessageBox.information(self, "Find", "Text not found!")
+                tab.setTextCursor(cursor)
 
     def change_language(self, lang):
         self.language_label.setText(f"Language: {lang}")
 
-    def detect_language(self, file_path):
-        ext = os.path.splitext(file_path)[1]
-        return SUPPORTED_EXTENSIONS.get(ext, 'Unknown')
+    def detect_language(self, tab):
+        return SUPPORTED_EXTENSIONS.get(tab._ext, 'Unknown')
 
     def run_script(self):
         tab = self.current_tab()
         if not tab or not tab.file_path:
             QMessageBox.warning(self, "Run Script", "You must save your script before running it!")
             return
-        ext = os.path.splitext(tab.file_path)[1]
-        if ext == ".py":
-            cmd = ["python", tab.file_path]
-        elif ext == ".bat":
-            cmd = ["cmd.exe", "/c", tab.file_path]
-        elif ext == ".ps1":
-            cmd = ["powershell", "-File", tab.file_path]
-        else:
+        builder = RUNNERS.get(tab._ext)
+        if not builder:
             QMessageBox.warning(self, "Run Script", "Unsupported script type!")
             return
+        cmd = builder(tab.file_path)
         tab.save()  # Save before running
-        try:
-            output = subprocess.check_output(cmd, stderr=subprocess.STDOUT, text=True, shell=True)
-            QMessageBox.information(self, "Execution Output", output)
-        except subprocess.CalledProcessError as e:
-            QMessageBox.warning(self, "Execution Error", e.output)
+        self._run_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.run_process = QProcess(self)
+        self.run_process.setProcessChannelMode(QProcess.MergedChannels)
+        self.run_process.readyReadStandardOutput.connect(self.on_run_output)
+        self.run_process.finished.connect(self.on_run_finished)
+        self.run_process.errorOccurred.connect(self.on_run_error)
+        self.run_action.setEnabled(False)
+        self.run_process.start(cmd[0], cmd[1:])
+
+    def on_run_output(self):
+        data = self._run_decoder.decode(bytes(self.run_process.readAllStandardOutput()))
+        if data:
+            self.terminal.output.appendPlainText(data)
+
+    def on_run_finished(self, exit_code, exit_status):
+        self.run_action.setEnabled(True)
+        self.status.showMessage(f"Script finished (exit code {exit_code})", 3000)
+        self.run_process.deleteLater()
+
+    def on_run_error(self, error):
+        # finished never fires when the program fails to start, so
+        # recover the Run action here; other errors still reach
+        # on_run_finished.
+        if error == QProcess.FailedToStart:
+            self.run_action.setEnabled(True)
+            self.terminal.output.appendPlainText(
+                f"[failed to start script: {self.run_process.errorString()}]")
+            self.run_process.deleteLater()
 
     def update_status(self):
         tab = self.current_tab()
         if tab and tab.file_path:
-            self.language_label.setText(f"Language: {self.detect_language(tab.file_path)}")
+            self.language_label.setText(f"Language: {self.detect_language(tab)}")
         else:
             self.language_label.setText("Language: ")
 